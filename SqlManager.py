@@ -1,10 +1,117 @@
 import MySQLdb
 import re
+import queue
+import threading
+import time
 from enum import Enum
 from typing import Union
 from typing import Any
+from typing import AsyncIterator
+from typing import Iterator
 import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from functools import singledispatchmethod
+from operator import itemgetter
+
+try:
+    import aiomysql
+except ImportError:
+    # aiomysqlはAsyncSqlManagerを利用する場合のみ必要
+    aiomysql = None
+
+# select関数で集約関数として扱う関数名(前方一致で誤判定しないよう長いものから並べる)
+_AGG_FUNCTIONS = (
+    'AVG', 'BIT_AND', 'BIT_OR', 'BIT_XOR', 'COUNT', 'GROUP_CONCAT', 'JSON_ARRAYAGG', 'JSON_OBJECTAGG',
+    'MAX', 'MIN', 'STDDEV_POP', 'STDDEV', 'STD', 'SUM', 'VAR_POP', 'VAR_SAMP', 'VARIANCE'
+)
+# カラム名が集約関数から始まる場合の判定用
+_AGG_PREFIXES = tuple(f"{function}(" for function in _AGG_FUNCTIONS)
+# 大文字に変換したカラム名に対して集約関数が利用されているかを判別する
+# 関数名の直後に括弧が続けば集約関数とみなし、閉じ括弧までは探さない
+_AGG_RE = re.compile(r'\b(?:' + '|'.join(_AGG_FUNCTIONS) + r')\s*\(')
+
+
+@lru_cache(maxsize=1024)
+def _quote_ident(column: str) -> str:
+    """
+    カラム名をバッククォートで囲む
+
+    カラム名に含まれるバッククォートはエスケープする
+
+    Parameters
+    ----------
+        column: str
+            カラム名
+
+    Returns
+    -------
+        str
+            バッククォートで囲んだカラム名
+    """
+    return "`" + column.replace("`", "``") + "`"
+
+
+@lru_cache(maxsize=64)
+def _placeholders(count: int) -> str:
+    """
+    指定した数のプレースホルダをカンマ区切りで作成する
+
+    Parameters
+    ----------
+        count: int
+            プレースホルダの数
+
+    Returns
+    -------
+        str
+            "%s, %s, ..." 形式の文字列
+    """
+    return ", ".join(["%s"] * count)
+
+
+def _where_scalar(column: str, condition: str, value: Any) -> str:
+    return f"{column} {condition} %s"
+
+
+def _where_in(column: str, condition: str, value: Any) -> str:
+    return f"{column} {condition} ({_placeholders(len(value))})"
+
+
+def _where_null(column: str, condition: str, value: Any) -> str:
+    return f"{column} {condition}"
+
+
+# where条件毎の条件句の組み立て方(カラム名はクォート済みのものを渡す)
+_WHERE_BUILDERS = {
+    '=': _where_scalar,
+    '>': _where_scalar,
+    '>=': _where_scalar,
+    '<': _where_scalar,
+    '<=': _where_scalar,
+    'LIKE': _where_scalar,
+    'IN': _where_in,
+    'NOT IN': _where_in,
+    'IS NULL': _where_null,
+    'IS NOT NULL': _where_null,
+}
+# where条件毎のプレースホルダに渡す値の取り出し方
+_WHERE_HOLDERS = {
+    '=': lambda value: (value,),
+    '>': lambda value: (value,),
+    '>=': lambda value: (value,),
+    '<': lambda value: (value,),
+    '<=': lambda value: (value,),
+    'LIKE': lambda value: (value,),
+    'IN': lambda value: value,
+    'NOT IN': lambda value: value,
+    'IS NULL': lambda value: (),
+    'IS NOT NULL': lambda value: (),
+}
+
 
 class ExecuteQueryType(Enum):
     SELECT = 1
@@ -12,11 +119,261 @@ class ExecuteQueryType(Enum):
     UPDATE = 3
     DELETE = 4
     COUNT = 5
+    UPSERT = 6
+
+
+@dataclass(frozen=True, slots=True)
+class QuerySpec:
+    """
+    組み立てるクエリの内容
+
+    SqlManagerで設定した条件をクエリ実行時に固定したもの
+    """
+
+    # テーブル名
+    table: str
+    # 取得するカラム
+    selects: tuple
+    # where句 ((カラム, 条件, 値), ...)
+    wheres: tuple
+    # order句 ((ASC or DESC, (カラム, ...)), ...)
+    order_by: tuple
+    # group句
+    group_by: str
+    # 挿入、更新するレコード
+    records: tuple
+
+
+class ConnectionPool:
+    """
+    MySQLdbのコネクションプール
+
+    使用済みのコネクションを閉じずに保持し、次回の接続時に再利用する
+    """
+
+    # この秒数以上待機していたコネクションは貸し出し前に生存確認する
+    PING_INTERVAL = 60
+
+    def __init__(self, settings: dict, mincached: int = 2, maxcached: int = 10, maxconnections: int = 50) -> None:
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+            settings: dict
+                接続情報
+            mincached: int
+                プール生成時に作成しておくコネクション数
+            maxcached: int
+                プールに保持するコネクションの最大数
+            maxconnections: int
+                同時に貸し出すコネクションの最大数(超えた場合は返却されるまで待機する)
+        """
+        self.__settings = dict(settings)
+        # (コネクション, 返却された時刻)
+        self.__idle_connections = queue.LifoQueue(maxcached)
+        self.__semaphore = threading.BoundedSemaphore(maxconnections)
+
+        for _ in range(min(mincached, maxcached)):
+            self.__idle_connections.put_nowait((self._connect(), time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """
+        コネクションを貸し出す
+
+        withブロックを抜けるとコネクションはプールに返却される
+        ドライバのエラーが発生した場合は、次回の貸し出し時に生存確認する
+
+        Returns
+        -------
+            conn : MySQLdb.connections.Connection
+                コネクション
+        """
+        conn = self.acquire()
+        is_failed = False
+        try:
+            yield conn
+        except MySQLdb.Error:
+            is_failed = True
+            raise
+        finally:
+            self.release(conn, is_failed)
+
+    def acquire(self) -> 'MySQLdb.connections.Connection':
+        """
+        コネクションを取得する
+
+        プールに空きがなければ新たに接続する
+        しばらく使われていなかったコネクション、エラーが発生したコネクションは生存確認し、
+        切断されていた場合は新たに接続する
+
+        Returns
+        -------
+            conn : MySQLdb.connections.Connection
+                コネクション
+        """
+        self.__semaphore.acquire()
+
+        try:
+            conn, released_at = self.__idle_connections.get_nowait()
+            if time.monotonic() - released_at < self.PING_INTERVAL or self._is_alive(conn):
+                return conn
+        except queue.Empty:
+            pass
+
+        try:
+            return self._connect()
+        except Exception:
+            self.__semaphore.release()
+            raise
+
+    def release(self, conn: 'MySQLdb.connections.Connection', is_failed: bool = False) -> None:
+        """
+        コネクションをプールに返却する
+
+        プールが一杯の場合はコネクションを閉じる
+
+        Parameters
+        ----------
+            conn : MySQLdb.connections.Connection
+                返却するコネクション
+            is_failed : bool
+                エラーが発生したコネクションかどうか
+                (切断されている可能性があるため、待機時間に関わらず次回の貸し出し時に生存確認する)
+        """
+        try:
+            self.__idle_connections.put_nowait((conn, float('-inf') if is_failed else time.monotonic()))
+        except queue.Full:
+            conn.close()
+        finally:
+            self.__semaphore.release()
+
+    def close(self) -> None:
+        """
+        プールに保持しているコネクションを閉じる
+
+        貸し出し中のコネクションは返却時にプールへ戻る
+        """
+        while True:
+            try:
+                self.__idle_connections.get_nowait()[0].close()
+            except queue.Empty:
+                return
+
+    def _is_alive(self, conn: 'MySQLdb.connections.Connection') -> bool:
+        """
+        コネクションが生きているかを確認する
+
+        切断されていた場合はコネクションを閉じる
+
+        Parameters
+        ----------
+            conn : MySQLdb.connections.Connection
+                確認するコネクション
+
+        Returns
+        -------
+            bool
+                生きているかどうか
+        """
+        try:
+            conn.ping()
+        except MySQLdb.Error:
+            try:
+                conn.close()
+            except MySQLdb.Error:
+                pass
+            return False
+
+        return True
+
+    def _connect(self) -> 'MySQLdb.connections.Connection':
+        """
+        MySQLに接続する
+
+        Returns
+        -------
+            MySQLdb.connections.Connection
+                コネクション
+        """
+        return MySQLdb.connect(**self.__settings)
+
+
+_connection_pools = {}
+_connection_pools_lock = threading.Lock()
+
+
+def get_connection_pool(settings: dict, mincached: int = 2, maxcached: int = 10, maxconnections: int = 50) -> ConnectionPool:
+    """
+    接続情報に対応するコネクションプールを取得する
+
+    同じ接続情報、プールサイズであれば同じプールを返す
+
+    Parameters
+    ----------
+        settings: dict
+            接続情報
+        mincached: int
+            プール生成時に作成しておくコネクション数
+        maxcached: int
+            プールに保持するコネクションの最大数
+        maxconnections: int
+            同時に貸し出すコネクションの最大数
+
+    Returns
+    -------
+        pool : ConnectionPool
+            コネクションプール
+    """
+    key = (frozenset(settings.items()), mincached, maxcached, maxconnections)
+
+    with _connection_pools_lock:
+        pool = _connection_pools.get(key)
+    if pool is not None:
+        return pool
+
+    # 接続には時間がかかるため、ロックを保持したままプールを作成しない
+    new_pool = ConnectionPool(settings, mincached, maxcached, maxconnections)
+    with _connection_pools_lock:
+        pool = _connection_pools.setdefault(key, new_pool)
+
+    # 他のスレッドが先に作成していた場合は、作成したプールを閉じてそちらを使う
+    if pool is not new_pool:
+        new_pool.close()
+
+    return pool
 
 
 class SqlManager:
 
-    def __init__(self, settings: dict) -> None:
+    # インスタンス毎の__dict__を持たないようにする(名前は_SqlManager__xxxにマングリングされる)
+    __slots__ = (
+        '__default_setting',
+        '__table',
+        '__where_list',
+        '__holder_value_list',
+        '__select',
+        '__insert_or_update_list',
+        '__order_by_list',
+        '__group_by',
+        '__enable_transaction',
+        '__connection',
+        '__transaction_cursor',
+        '__pool',
+        '__pool_setting',
+        '__insert_chunk_size',
+        '__query_cache',
+        '__pending_inserts',
+        '__result_cache',
+        '__result_cache_size',
+        '__last_insert_id'
+    )
+
+    # 組み立て済みクエリを保持する最大数
+    QUERY_CACHE_SIZE = 256
+
+    def __init__(self, settings: dict, mincached: int = 2, maxcached: int = 10, maxconnections: int = 50, insert_chunk_size: int = 1000) -> None:
         """
         コンストラクタ
 
@@ -24,6 +381,14 @@ class SqlManager:
         ----------
             settings: dict
                 接続情報
+            mincached: int
+                コネクションプール生成時に作成しておくコネクション数
+            maxcached: int
+                コネクションプールに保持するコネクションの最大数
+            maxconnections: int
+                同時に利用するコネクションの最大数
+            insert_chunk_size: int
+                複数レコードの挿入時に1回で送信するレコード数
         """
         self.__default_setting = {
             'user': settings['user'],
@@ -32,8 +397,8 @@ class SqlManager:
             'db': settings['db']
         }
         self.__table = ''
+        # [(カラム, 条件, 値)]
         self.__where_list = []
-        self.__where_condition_list = []
         self.__holder_value_list = {
             'insert' : [],
             'update' : [],
@@ -45,26 +410,30 @@ class SqlManager:
         self.__group_by = ''
         self.__enable_transaction = False
         self.__connection = None
-
-    def __del__(self) -> None:
-        """
-        デストラクタ
-        """
-        del self.__table
-        del self.__where_list
-        del self.__where_condition_list
-        del self.__holder_value_list
-        del self.__select
-        del self.__insert_or_update_list
-        del self.__order_by_list
-        del self.__group_by
-        del self.__enable_transaction
-        del self.__connection
+        self.__transaction_cursor = None
+        self.__pool = None
+        self.__pool_setting = {
+            'mincached': mincached,
+            'maxcached': maxcached,
+            'maxconnections': maxconnections
+        }
+        self.__insert_chunk_size = insert_chunk_size
+        self.__query_cache = OrderedDict()
+        # queue_createで溜めているレコード {テーブル名 : [レコード]}
+        self.__pending_inserts = {}
+        # enable_result_cacheで有効にした場合のみ利用する取得結果のキャッシュ
+        self.__result_cache = None
+        self.__result_cache_size = 0
+        # 最後に挿入したレコードのAUTO_INCREMENTの値
+        self.__last_insert_id = None
 
     def begin_transaction(self) -> None:
         """
         トランザクション開始
+
+        queue_createで溜めているレコードはトランザクションに含めず、開始前に挿入する
         """
+        self.flush()
         self.__enable_transaction = True
 
     def end_transaction(self, is_succeed: bool) -> None:
@@ -76,11 +445,107 @@ class SqlManager:
             is_succeed : bool
                 処理が成功したのならばコミットする。
                 してなければrollbackする。
+                トランザクション中にqueue_createで溜めたレコードは成功時は挿入し、失敗時は破棄する
         """
+        if is_succeed:
+            self.flush()
+        else:
+            self._discard_pending_inserts()
+            # rollbackで取り消されるデータを取得した結果が残らないようにする
+            if self.__result_cache is not None:
+                self.__result_cache.clear()
+
         self.__enable_transaction = False
-        self.__connection.commit() if is_succeed else self.__connection.rollback()
-        self.__connection.close()
+
+        if self.__transaction_cursor is not None:
+            self.__transaction_cursor.close()
+            self.__transaction_cursor = None
+
+        if self.__connection is None:
+            return
+
+        conn = self.__connection
         self.__connection = None
+        is_failed = False
+        try:
+            conn.commit() if is_succeed else conn.rollback()
+        except MySQLdb.Error:
+            # 切断されていた場合も返却し、次回の貸し出し時に生存確認させる
+            is_failed = True
+            raise
+        finally:
+            self._get_pool().release(conn, is_failed)
+
+    def close(self) -> None:
+        """
+        コネクションを閉じる
+
+        トランザクション中であればrollbackしてトランザクションを終了し、
+        そうでなければqueue_createで溜めているレコードを挿入してから、
+        プールに保持しているコネクションを閉じる
+        プールは同じ接続情報の他のSqlManagerと共有しているため、
+        それらのインスタンスが次に利用するコネクションも再接続になる
+        """
+        # クエリを実行せずにトランザクションを開始していた場合も終了させる
+        if self.__connection is not None or self.__enable_transaction:
+            self.end_transaction(False)
+        else:
+            self.flush()
+
+        if self.__pool is not None:
+            self.__pool.close()
+
+    def enable_result_cache(self, maxsize: int = 128) -> 'SqlManager':
+        """
+        取得結果のキャッシュを有効にする
+
+        同じクエリ、値のfind_records、countはDBに問い合わせずに前回の結果を返す
+        Dict形式の結果は行毎にコピーして返すため、呼び出し元で書き換えてもキャッシュには影響しない
+        ハッシュできない値を条件に指定したクエリはキャッシュしない
+        このインスタンスでcreate、update、delete、upsertを実行するとキャッシュは破棄される
+        他の接続からの更新は検知できないため、更新されないテーブルの参照などに限って利用する
+
+        Parameters
+        ----------
+            maxsize: int
+                保持する取得結果の最大数
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス
+        """
+        self.__result_cache = OrderedDict()
+        self.__result_cache_size = maxsize
+
+        return self
+
+    def disable_result_cache(self) -> 'SqlManager':
+        """
+        取得結果のキャッシュを無効にし、保持している結果を破棄する
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス
+        """
+        self.__result_cache = None
+
+        return self
+
+    def last_insert_id(self) -> Union[int, None]:
+        """
+        最後に挿入したレコードのAUTO_INCREMENTの値を取得する
+
+        挿入後にSELECTで取得し直さなくてもIDが分かる
+        複数レコードを挿入した場合は、最後に送信した分割の先頭のレコードの値になる
+
+        Returns
+        -------
+            last_insert_id: Union[int, None]
+                AUTO_INCREMENTの値(挿入していない場合はNone)
+        """
+        return self.__last_insert_id
 
     def from_table(self, table: str) -> 'SqlManager':
         """
@@ -101,6 +566,23 @@ class SqlManager:
 
         return self
 
+    def reset_query(self) -> 'SqlManager':
+        """
+        組み立て中のクエリを破棄する
+
+        テーブルの指定も含めて、インスタンス生成直後の状態に戻す
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス
+        """
+
+        self._take_query_spec()
+        self.__table = ''
+
+        return self
+
     def where(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句
@@ -141,6 +623,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, 'IN')
 
+        return self
+
     def where_not_in(self, column: str, value: list) -> 'SqlManager':
         """
         where句
@@ -161,6 +645,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, 'NOT IN')
 
+        return self
+
     def where_gt(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句(>)
@@ -179,6 +665,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, '>')
 
+        return self
+
     def where_gte(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句(>=)
@@ -197,6 +685,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, '>=')
 
+        return self
+
     def where_lt(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句(<)
@@ -215,6 +705,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, '<')
 
+        return self
+
     def where_lte(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句(<=)
@@ -233,6 +725,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, '<=')
 
+        return self
+
     def where_like(self, column: str, value: Union[int, str, datetime.date, datetime.datetime]) -> 'SqlManager':
         """
         where句(LIKE)
@@ -251,6 +745,8 @@ class SqlManager:
         """
         self._add_wheres(column, value, 'LIKE')
 
+        return self
+
     def where_is_null(self, column: str) -> 'SqlManager':
         """
         where句(IS NULL)
@@ -267,6 +763,8 @@ class SqlManager:
         """
         self._add_wheres(column, None, 'IS NULL')
 
+        return self
+
     def where_is_not_null(self, column: str) -> 'SqlManager':
         """
         where句(IS NOT NULL)
@@ -285,6 +783,8 @@ class SqlManager:
         """
         self._add_wheres(column, None, 'IS NOT NULL')
 
+        return self
+
     def select(self, column: str, as_column: str = None) -> 'SqlManager':
         """
         取得するカラムを指定する
@@ -302,15 +802,36 @@ class SqlManager:
                 自身のインスタンス            
         """
 
-        query_select = f"{format(column)}" if self._is_use_aggregate_functions(column) else f"`{format(column)}`"
+        query_select = f"{format(column)}" if self._is_use_aggregate_functions(column) else _quote_ident(format(column))
 
         if as_column is not None:
-            query_select += f" AS {format(as_column)}"
+            query_select = f"{query_select} AS {format(as_column)}"
 
         self.__select.append(query_select)
 
         return self
 
+    def selects(self, *columns: str) -> 'SqlManager':
+        """
+        取得するカラムをまとめて指定する
+
+        selectを続けて呼び出した場合と同じクエリになる(別名は指定できない)
+
+        Parameters
+        ----------
+        columns : str
+            取得するカラム名
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス            
+        """
+        self.__select.extend(
+            column if self._is_use_aggregate_functions(column) else _quote_ident(column) for column in columns)
+
+        return self
+
     @singledispatchmethod
     def set(self, column: str, value: Any) -> 'SqlManager':
         """
@@ -359,14 +880,15 @@ class SqlManager:
 
         return self
 
+    @singledispatchmethod
     def sets(self, data: Any) -> 'SqlManager':
         """
         複数レコードの挿入、更新
 
         Paramters
         ---------
-            data : Any(List[dict] or dict)
-                List[dict]の場合 : [{"id" : 1, "name" : "test",...},...]
+            data : Any(List[dict], Tuple[dict] or dict)
+                List[dict]、Tuple[dict]の場合 : [{"id" : 1, "name" : "test",...},...]
                 dictの場合 : {"id" : 1, "name" : "test",...}
 
         Returns
@@ -374,14 +896,50 @@ class SqlManager:
             self : SqlManager
                 自身のインスタンス
         """
-        # {カラム : 値}
-        if isinstance(data, dict):
-            self.__insert_or_update_list.append(data)
-        # [{カラム : 値}]
-        elif isinstance(data[0], dict):
-            self.__insert_or_update_list.extend(data)
-        else:
+        print("想定していないデータが設定されました。")
+
+        return self
+
+    @sets.register(dict)
+    def arg_dict_sets(self, data: dict) -> 'SqlManager':
+        """
+        複数レコードの挿入、更新({カラム : 値})
+
+        Paramters
+        ---------
+            data : dict
+                挿入、更新するレコード
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス
+        """
+        self.__insert_or_update_list.append(data)
+
+        return self
+
+    @sets.register(list)
+    @sets.register(tuple)
+    def arg_list_sets(self, data: Union[list, tuple]) -> 'SqlManager':
+        """
+        複数レコードの挿入、更新([{カラム : 値}])
+
+        Paramters
+        ---------
+            data : Union[list, tuple]
+                挿入、更新するレコードのリスト(tupleも可)
+
+        Returns
+        -------
+            self : SqlManager
+                自身のインスタンス
+        """
+        if len(data) > 0 and not isinstance(data[0], dict):
             print("想定していないデータが設定されました。")
+            return self
+
+        self.__insert_or_update_list.extend(data)
 
         return self
 
@@ -435,7 +993,10 @@ class SqlManager:
             self: SqlManager
                 自身のインスタンス            
         """
-        self.__group_by = " GROUP BY " + (column if type(column) is str else ', '.join(column) + ' ')
+        columns = column if isinstance(column, str) else ', '.join(column)
+        self.__group_by = " GROUP BY " + columns
+
+        return self
 
     def update(self) -> None:
         """
@@ -447,12 +1008,47 @@ class SqlManager:
         """
         レコードを作成する
 
+        複数レコードの場合はexecutemanyでまとめて挿入し、1回でコミットする
+        """
+        self._execute(ExecuteQueryType.INSERT)
+
+    def upsert(self) -> None:
+        """
+        レコードを作成し、キーが重複する場合は更新する
+
+        INSERT ... ON DUPLICATE KEY UPDATEで挿入と更新を1回のクエリで行う
+        複数レコードの場合はexecutemanyでまとめて送信し、1回でコミットする
+        """
+        self._execute(ExecuteQueryType.UPSERT)
+
+    def queue_create(self, data: dict) -> 'SqlManager':
+        """
+        挿入するレコードを溜めておき、まとめて挿入する
+
+        溜めたレコードがinsert_chunk_size件に達するか、flush、end_transaction(True)を
+        呼び出した時点でテーブル毎に複数レコードの挿入を行う
+
+        Paramters
+        ---------
+            data : dict
+                挿入するレコード {"id" : 1, "name" : "test",...}
+
         Returns
         -------
             self : SqlManager
                 自身のインスタンス
         """
-        self._execute(ExecuteQueryType.INSERT)
+        if self._queue_insert(data):
+            self.flush()
+
+        return self
+
+    def flush(self) -> None:
+        """
+        queue_createで溜めているレコードを挿入する
+        """
+        for spec in self._take_pending_inserts():
+            self._execute(ExecuteQueryType.INSERT, spec=spec)
 
     def count(self) -> int:
         """
@@ -471,7 +1067,7 @@ class SqlManager:
         """
         self._execute(ExecuteQueryType.DELETE)
 
-    def find_records(self, is_dict_cursor:bool = False) -> Any:
+    def find_records(self, is_dict_cursor:bool = False, stream: bool = False) -> Any:
         """
         複数データを取得する
 
@@ -480,15 +1076,66 @@ class SqlManager:
             is_dict_cursor : bool
                 Dict形式で取得するかどうか(Falseの場合はlist形式)
 
+            stream : bool
+                サーバーサイドカーソルで1行ずつ取得するかどうか(find_records_iterと同じ)
+
         Returns
         -------
             is_dict_cursor が Falseの場合 [[1, 2,...],...]
 
             is_dict_cursor が Trueの場合  [{'key1' : 1, 'key2' : 2, ...},...]
+
+            stream が Trueの場合は上記の1行ずつを返すジェネレータ
         """
+        if stream:
+            return self.find_records_iter(is_dict_cursor)
+
         return self._execute(ExecuteQueryType.SELECT, is_dict_cursor)
 
-    def _execute(self, execute_query_type: ExecuteQueryType, is_dict_cursor: Union[bool, None] = None):
+    def find_records_iter(self, is_dict_cursor: bool = False) -> Iterator:
+        """
+        複数データを1行ずつ取得する
+
+        サーバーサイドカーソルを利用するため、結果をすべてメモリに載せずに処理できる
+
+        Paramters
+        ---------
+            is_dict_cursor : bool
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+        Returns
+        -------
+            is_dict_cursor が Falseの場合 (1, 2,...) を1行ずつ返すジェネレータ
+
+            is_dict_cursor が Trueの場合  {'key1' : 1, 'key2' : 2, ...} を1行ずつ返すジェネレータ
+        """
+        query, holder_value_list = self._query_build(ExecuteQueryType.SELECT)
+
+        return self._iterate_records(query, holder_value_list, is_dict_cursor)
+
+    def build(self, execute_query_type: ExecuteQueryType = ExecuteQueryType.SELECT) -> tuple:
+        """
+        実行クエリタイプに沿ったクエリを、実行せずに組み立てる
+
+        実行時と同様に組み立て中の条件はリセットされる
+
+        Paramters
+        ---------
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ(省略時はfind_recordsで実行するSELECT)
+
+        Returns
+        -------
+            query: str
+                組み立てたクエリ
+
+            holder_value_list: Union[list, None]
+                プレースホルダに渡す値
+                (INSERT、UPSERTの場合はレコード毎の値のリスト)
+        """
+        return self._query_build(execute_query_type)
+
+    def _execute(self, execute_query_type: ExecuteQueryType, is_dict_cursor: Union[bool, None] = None, spec: Union[QuerySpec, None] = None):
         """
         実行クエリタイプに沿ったクエリの実行を行う。
 
@@ -500,63 +1147,258 @@ class SqlManager:
             is_dict_cursor: Union[bool, None]
                 Dict形式で取得するかどうか(Falseの場合はlist形式)
 
+            spec: Union[QuerySpec, None]
+                組み立てるクエリの内容(Noneの場合は組み立て中の内容を使う)
+
         Returns
         -------
             retValue: Any
                 execute_query_type が SELECTの場合: list
                 execute_query_type が COUNTの場合: int
         """
-        if self.__enable_transaction:
-            conn =  self._connect() if self.__connection is None else self.__connection 
-            conn.autocommit(False)
-            self.__connection = conn
-        else:
-            conn = self._connect()
-            conn.autocommit(True)
+        query, holder_value_list = self._query_build(execute_query_type, spec)
+
+        result_key = None
+        if self.__result_cache is not None:
+            if execute_query_type in [ExecuteQueryType.SELECT, ExecuteQueryType.COUNT]:
+                result_key = (
+                    execute_query_type, query, None if holder_value_list is None else tuple(holder_value_list), bool(is_dict_cursor))
+                try:
+                    is_cached = result_key in self.__result_cache
+                except TypeError:
+                    # ハッシュできない値をプレースホルダに渡した場合はキャッシュしない
+                    result_key = None
+                    is_cached = False
+
+                if is_cached:
+                    self.__result_cache.move_to_end(result_key)
+                    return self._copy_result(self.__result_cache[result_key], is_dict_cursor)
+            else:
+                # 更新系のクエリを実行する場合はキャッシュした結果を破棄する
+                self.__result_cache.clear()
+
+        # 複数レコードの挿入は分割して送信しても1回でコミットする
+        autocommit = not (execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT] and len(holder_value_list) > 1)
+
+        with self._connection(autocommit) as conn:
+            with self._cursor(conn, is_dict_cursor) as cur:
+                if execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT]:
+                    for records in self._split_insert_records(holder_value_list):
+                        cur.executemany(query, records)
+                        self._set_last_insert_id(cur.lastrowid)
+                elif holder_value_list is None:
+                    cur.execute(query)
+                else:
+                    cur.execute(query, holder_value_list)
 
-        cur = conn.cursor(MySQLdb.cursors.DictCursor) if is_dict_cursor else conn.cursor()
+                retVal = None
+                if execute_query_type == ExecuteQueryType.SELECT:
+                    retVal = cur.fetchall()
+                elif execute_query_type == ExecuteQueryType.COUNT:
+                    rows = cur.fetchall()
+                    retVal = int(rows[0][0])
 
-        query = self._query_build(execute_query_type)
+        if result_key is not None:
+            self.__result_cache[result_key] = self._copy_result(retVal, is_dict_cursor)
+            if len(self.__result_cache) > self.__result_cache_size:
+                self.__result_cache.popitem(last=False)
 
-        holder_value_list = None
-        if execute_query_type in [ExecuteQueryType.SELECT, ExecuteQueryType.DELETE, ExecuteQueryType.COUNT]:
-            holder_value_list = None if len(self.__holder_value_list['where']) == 0 else tuple(self.__holder_value_list['where'])
-        elif execute_query_type == ExecuteQueryType.INSERT:
-            holder_value_list = None if len(self.__holder_value_list['insert']) == 0 else tuple(self.__holder_value_list['insert'])
-        elif execute_query_type == ExecuteQueryType.UPDATE:
-            holder_value_list = tuple(self.__holder_value_list['update']) + tuple(self.__holder_value_list['where'])
+        return retVal
+
+    def _copy_result(self, result: Any, is_dict_cursor: Union[bool, None]) -> Any:
+        """
+        キャッシュする取得結果をコピーする
+
+        Dict形式の行は呼び出し元で書き換えられるため、行毎にコピーする
+        (list形式の行はtupleのためコピーしない)
+
+        Paramters
+        ---------
+            result: Any
+                取得結果
+            is_dict_cursor: Union[bool, None]
+                Dict形式で取得したかどうか
+
+        Returns
+        -------
+            Any
+                コピーした取得結果
+        """
+        if is_dict_cursor:
+            return tuple(dict(row) for row in result)
+
+        return result
+
+    def _set_last_insert_id(self, last_insert_id: Union[int, None]) -> None:
+        """
+        最後に挿入したレコードのAUTO_INCREMENTの値を保持する
+
+        Paramters
+        ---------
+            last_insert_id: Union[int, None]
+                カーソルのlastrowid
+        """
+        self.__last_insert_id = last_insert_id
+
+    def _iterate_records(self, query: str, holder_value_list: Union[list, None], is_dict_cursor: bool) -> Iterator:
+        """
+        サーバーサイドカーソルでSELECTを実行し、1行ずつ返す
+
+        Paramters
+        ---------
+            query: str
+                実行するクエリ
+
+            holder_value_list: Union[list, None]
+                プレースホルダに渡す値
+
+            is_dict_cursor: bool
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+        Returns
+        -------
+            取得したレコードを1行ずつ返すジェネレータ
+        """
+        with self._connection() as conn:
+            with conn.cursor(MySQLdb.cursors.SSDictCursor if is_dict_cursor else MySQLdb.cursors.SSCursor) as cur:
+                if holder_value_list is None:
+                    cur.execute(query)
+                else:
+                    cur.execute(query, holder_value_list)
+
+                yield from cur
+
+    @contextmanager
+    def _connection(self, autocommit: bool = True):
+        """
+        クエリを実行するコネクションを取得する
+
+        トランザクション中であればトランザクション用のコネクションを、
+        そうでなければプールから借りたコネクションを返す
+
+        Parameters
+        ----------
+            autocommit: bool
+                トランザクション外でautocommitにするかどうか
+                Falseの場合はwithブロックを抜けた時にコミットする(例外時はrollbackする)
+
+        Returns
+        -------
+            conn : MySQLdb.connections.Connection
+                コネクション
+        """
+        if self.__enable_transaction:
+            if self.__connection is None:
+                self.__connection = self._get_pool().acquire()
+                self.__connection.autocommit(False)
+            yield self.__connection
+            return
+
+        with self._get_pool().connection() as conn:
+            conn.autocommit(autocommit)
+            if autocommit:
+                yield conn
+                return
+
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    @contextmanager
+    def _cursor(self, conn: 'MySQLdb.connections.Connection', is_dict_cursor: Union[bool, None]):
+        """
+        クエリを実行するカーソルを取得する
+
+        トランザクション中はlist形式のカーソルを使い回し、end_transactionで閉じる
+
+        Parameters
+        ----------
+            conn : MySQLdb.connections.Connection
+                コネクション
+            is_dict_cursor: Union[bool, None]
+                Dict形式で取得するかどうか
+
+        Returns
+        -------
+            cur : MySQLdb.cursors.Cursor
+                カーソル
+        """
+        if is_dict_cursor:
+            with conn.cursor(MySQLdb.cursors.DictCursor) as cur:
+                yield cur
+            return
+
+        if self.__enable_transaction:
+            if self.__transaction_cursor is None:
+                self.__transaction_cursor = conn.cursor()
+            yield self.__transaction_cursor
+            return
+
+        with conn.cursor() as cur:
+            yield cur
+
+    def _split_insert_records(self, holder_value_list: list) -> Iterator:
+        """
+        挿入するレコードをinsert_chunk_size毎に分割する
+
+        max_allowed_packetを超える巨大なクエリにならないようにする
+
+        Paramters
+        ---------
+            holder_value_list: list
+                1レコード毎のtupleのlist
+
+        Returns
+        -------
+            insert_chunk_size件毎のlistを返すジェネレータ
+        """
+        chunk_size = self.__insert_chunk_size
+        for i in range(0, len(holder_value_list), chunk_size):
+            yield holder_value_list[i:i + chunk_size]
+
+    def _take_holder_value_list(self, execute_query_type: ExecuteQueryType) -> Any:
+        """
+        実行クエリタイプに沿ったプレースホルダの値を取り出し、保持している値をリセットする
+
+        Paramters
+        ---------
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ
+
+        Returns
+        -------
+            holder_value_list: Any
+                execute_query_type が INSERT、UPSERTの場合: 1レコード毎のtupleのlist
+                それ以外の場合: list(値がなければNone)
+        """
+        # 保持しているリストは直後に作り直すため、コピーせずにそのまま渡す
+        holder_value_list = None
+        if execute_query_type in [ExecuteQueryType.SELECT, ExecuteQueryType.DELETE, ExecuteQueryType.COUNT]:
+            holder_value_list = None if len(self.__holder_value_list['where']) == 0 else self.__holder_value_list['where']
+        elif execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT]:
+            holder_value_list = self.__holder_value_list['insert']
+        elif execute_query_type == ExecuteQueryType.UPDATE:
+            holder_value_list = self.__holder_value_list['update']
+            holder_value_list.extend(self.__holder_value_list['where'])
 
-        if holder_value_list is None:
-            cur.execute(query)
-        else:
-            cur.execute(query, holder_value_list)
-            
         self.__holder_value_list['where'] = []
         self.__holder_value_list['insert'] = []
         self.__holder_value_list['update'] = []
 
-        retVal = None
-        if execute_query_type == ExecuteQueryType.SELECT:
-            retVal = cur.fetchall()
-        elif execute_query_type == ExecuteQueryType.COUNT:
-            rows = cur.fetchall()
-            retVal = int(rows[0][0])
+        return holder_value_list
 
-        if self.__enable_transaction:
-            cur.close
-            del cur
-        else:
-            cur.close
-            conn.close
-            del cur
-            del conn
-        
-        return retVal
-
-    def _query_where_build(self) -> str:
+    def _query_where_build(self, spec: QuerySpec) -> str:
         """
         where句のクエリを作成する
 
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+
         Returns
         -------
             str : query
@@ -564,174 +1406,361 @@ class SqlManager:
         """
         query = ""
 
-        if (len(self.__where_list) == 0):
+        if (len(spec.wheres) == 0):
             return query
 
-        wheres = []
-        for i, where in enumerate(self.__where_list):
-
-            where_condition = self.__where_condition_list[i]
-            for column, value in where.items():
-                condition = where_condition[column]
-
-                if 'IN' in condition:
-                    wheres.append(
-                        f"`{column}` {condition} (" + ', '.join(["%s"] * len(value)) + ")")
-                    self.__holder_value_list['where'].extend(value)
-                elif 'IS NULL' in condition or 'IS NOT NULL' in condition:
-                    wheres.append(
-                        f"`{column}` {condition}")
-                else:
-                    # >, >=, <, <=, LIKE
-                    wheres.append(f"`{column}` {condition} %s")
-                    self.__holder_value_list['where'].append(value)
+        wheres = [_WHERE_BUILDERS[condition](_quote_ident(column), condition, value) for column, condition, value in spec.wheres]
 
-        query = ' WHERE ' + ' AND '.join(wheres)
+        query = f" WHERE {' AND '.join(wheres)}"
 
         return query
 
-    def _query_insert_build(self) -> str:
+    def _query_insert_build(self, spec: QuerySpec) -> str:
         """
         Insert句のクエリを作成する
 
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+
         Returns
         -------
             str : query
                 作成したクエリ            
         """
-        query = ""
+        columns = [_quote_ident(miexed) for miexed in spec.records[0]]
 
-        insert_or_update_list = self.__insert_or_update_list
+        # 複数レコードの場合もexecutemanyで1行分のテンプレートを使い回す
+        return "".join(["(", ", ".join(columns), ") VALUES(", _placeholders(len(columns)), ")"])
 
-        columns = [f"`{miexed}`" for miexed in insert_or_update_list[0]]
+    def _query_upsert_build(self, spec: QuerySpec) -> str:
+        """
+        ON DUPLICATE KEY UPDATE句のクエリを作成する
 
-        query += f"({', '.join(columns)}) VALUES"
+        更新する値はVALUES()で挿入しようとした値を参照し、プレースホルダを増やさない
 
-        multiple_insert_list = []
-        for insert_or_update in insert_or_update_list:
-            insert_list = insert_or_update.values()
-            self.__holder_value_list['insert'].extend(insert_list)
-            multiple_insert_list.append("(" + ', '.join(["%s"] * len(insert_list)) + ")")
-        query += ",".join(multiple_insert_list)
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
 
-        return query
+        Returns
+        -------
+            str : query
+                作成したクエリ            
+        """
+        columns = [_quote_ident(column) for column in spec.records[0]]
+
+        return f" ON DUPLICATE KEY UPDATE {', '.join(f'{column} = VALUES({column})' for column in columns)}"
 
-    def _query_update_build(self) -> str:
+    def _query_update_build(self, spec: QuerySpec) -> str:
         """
         Update句のクエリを作成する
 
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+
         Returns
         -------
             str : query
                 作成したクエリ            
         """
-        query = ""
-
-        update_list = []
-
         # updateで複数行のデータをそれぞれ更新することはできないので、
         # 配列データが格納されているが１つしか存在しない
-        insert_or_update = self.__insert_or_update_list[0]
-
-        for column, value in insert_or_update.items():
-            update_list.append(f"`{column}` = %s")
-            self.__holder_value_list['update'].append(value)
+        insert_or_update = spec.records[0]
 
-        query += ", ".join(update_list)
+        return ", ".join(f"{_quote_ident(column)} = %s" for column in insert_or_update)
 
-        return query
-
-    def _query_order_build(self) -> str:
+    def _query_order_build(self, spec: QuerySpec) -> str:
         """
         Order句のクエリを作成する
 
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+
         Returns
         -------
             query: str
                 order句のクエリ
         """
-        if len(self.__order_by_list) == 0:
+        if len(spec.order_by) == 0:
             return ''
         
-        query = ''
-        for order_by in self.__order_by_list:
-            order = order_by['order']
-            columns = order_by['columns']
+        return "".join(f" ORDER BY {','.join(columns)} {order} " for order, columns in spec.order_by)
 
-            query += ' ORDER BY ' + ','.join(columns) + f" {order} "
-        
-        return query
+    def _query_holder_build(self, spec: QuerySpec, execute_query_type: ExecuteQueryType) -> None:
+        """
+        プレースホルダに渡す値をクエリの並び順に沿って設定する
+
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ
+        """
+        if execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT]:
+            # 1件目のカラム順で全レコードの値を取り出す(itemgetterは1カラムだとtupleを返さない)
+            columns = list(spec.records[0])
+            if len(columns) == 1:
+                column = columns[0]
+                self.__holder_value_list['insert'].extend((record[column],) for record in spec.records)
+            else:
+                self.__holder_value_list['insert'].extend(map(itemgetter(*columns), spec.records))
+            return
+
+        if execute_query_type == ExecuteQueryType.UPDATE:
+            self.__holder_value_list['update'].extend(spec.records[0].values())
+
+        self.__holder_value_list['where'] = [
+            v for _, condition, value in spec.wheres for v in _WHERE_HOLDERS[condition](value)]
+
+    def _query_shape(self, spec: QuerySpec, execute_query_type: ExecuteQueryType) -> tuple:
+        """
+        クエリの形を表すキーを作成する
+
+        値が異なるだけのクエリは同じキーになる
+
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ
+
+        Returns
+        -------
+            shape: tuple
+                クエリキャッシュのキー
+        """
+        wheres = tuple(
+            (column, condition, len(value) if 'IN' in condition else None) for column, condition, value in spec.wheres)
+
+        columns = ()
+        if execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPDATE, ExecuteQueryType.UPSERT] and len(spec.records) > 0:
+            columns = tuple(spec.records[0])
+
+        return (
+            execute_query_type,
+            spec.table,
+            spec.selects,
+            wheres,
+            spec.order_by,
+            spec.group_by,
+            columns
+        )
+
+    def _take_query_spec(self) -> QuerySpec:
+        """
+        組み立て中のクエリの内容を取り出し、組み立て中の状態をリセットする
+
+        テーブルは次のクエリでも使えるように保持する
+
+        Returns
+        -------
+            spec: QuerySpec
+                組み立てるクエリの内容
+        """
+        spec = QuerySpec(
+            table=self.__table,
+            selects=tuple(self.__select),
+            wheres=tuple(self.__where_list),
+            order_by=tuple((order_by['order'], tuple(order_by['columns'])) for order_by in self.__order_by_list),
+            group_by=self.__group_by,
+            records=tuple(self.__insert_or_update_list)
+        )
+
+        # specはtupleにコピー済みのため、リストは作り直さずに中身だけ空にする
+        self.__where_list.clear()
+        self.__select.clear()
+        self.__insert_or_update_list.clear()
+        self.__order_by_list.clear()
+        self.__group_by = ''
+
+        return spec
 
-    def _query_build(self, ExecuteQueryType: ExecuteQueryType) -> str:
+    def _query_build(self, ExecuteQueryType: ExecuteQueryType, spec: Union[QuerySpec, None] = None) -> tuple:
         """
-        クエリを組み立てる
+        クエリとプレースホルダに渡す値を組み立てる
+
+        同じ形のクエリが組み立て済みであればキャッシュを利用し、
+        プレースホルダに渡す値のみ設定する
+
+        Parameters
+        ----------
+            spec: Union[QuerySpec, None]
+                組み立てるクエリの内容(Noneの場合は組み立て中の内容を取り出す)
 
         Returns
         -------
             str : query
                 作成したクエリ          
+            Any : holder_value_list
+                プレースホルダに渡す値(_take_holder_value_listを参照)
         """
+        if spec is None:
+            # テーブル未指定でエラーにする場合も、組み立て中の条件が次のクエリに残らないよう先に取り出す
+            spec = self._take_query_spec()
+            self._check_table()
 
-        query = ""
+        self._check_records(spec, ExecuteQueryType)
+
+        shape = self._query_shape(spec, ExecuteQueryType)
+
+        query = self.__query_cache.get(shape)
+        if query is not None:
+            self.__query_cache.move_to_end(shape)
+        else:
+            query = self._query_text_build(spec, ExecuteQueryType)
+            self.__query_cache[shape] = query
+            if len(self.__query_cache) > self.QUERY_CACHE_SIZE:
+                self.__query_cache.popitem(last=False)
+
+        # 組み立てに失敗しても値が次のクエリに残らないよう、必ず取り出してリセットする
+        try:
+            self._query_holder_build(spec, ExecuteQueryType)
+        finally:
+            holder_value_list = self._take_holder_value_list(ExecuteQueryType)
+
+        return query, holder_value_list
+
+    def _query_text_build(self, spec: QuerySpec, ExecuteQueryType: ExecuteQueryType) -> str:
+        """
+        クエリの文字列を組み立てる
+
+        where句、order句が指定されていなければ組み立て処理自体を呼ばない
+
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+
+        Returns
+        -------
+            str : query
+                作成したクエリ          
+        """
+
+        parts = []
+
+        where = self._query_where_build(spec) if spec.wheres else ''
+        order = self._query_order_build(spec) if spec.order_by else ''
 
         if ExecuteQueryType == ExecuteQueryType.SELECT:
-            if len(self.__select) == 0:
-                self.__select.append("*")
-            query = "SELECT {} FROM {}".format(
-                ",".join(self.__select), self.__table)
-            query += self._query_where_build()
-            query += self._query_order_build()
-            query += self.__group_by
+            if len(spec.selects) == 0:
+                select = "*"
+            elif len(spec.selects) == 1:
+                select = spec.selects[0]
+            else:
+                select = ",".join(spec.selects)
+            parts = ["SELECT ", select, " FROM ", spec.table, where, spec.group_by, order]
 
         elif ExecuteQueryType == ExecuteQueryType.INSERT:
-            query = f"INSERT INTO {self.__table}"
-            query += self._query_insert_build()
+            parts = ["INSERT INTO ", spec.table, self._query_insert_build(spec)]
+
+        elif ExecuteQueryType == ExecuteQueryType.UPSERT:
+            parts = ["INSERT INTO ", spec.table, self._query_insert_build(spec), self._query_upsert_build(spec)]
     
         elif ExecuteQueryType == ExecuteQueryType.DELETE:
-            query = f"DELETE FROM {self.__table}"
-            query += self._query_where_build()
+            parts = ["DELETE FROM ", spec.table, where]
 
         elif ExecuteQueryType == ExecuteQueryType.UPDATE:
-            query = f"UPDATE {self.__table} SET "
-            query += self._query_update_build()
-            query += self._query_where_build()
+            parts = ["UPDATE ", spec.table, " SET ", self._query_update_build(spec), where]
         
         elif ExecuteQueryType == ExecuteQueryType.COUNT:
-            query = f"SELECT COUNT(*) FROM {self.__table} "
-            query += self._query_where_build()
-            query += self._query_order_build()
-            query += self.__group_by
+            parts = ["SELECT COUNT(*) FROM ", spec.table, " ", where, spec.group_by, order]
 
         else:
             print(
-                f"指定したクエリタイプは対応されていません。 base_query_type = {type(self.__table)}")
+                f"指定したクエリタイプは対応されていません。 base_query_type = {type(spec.table)}")
 
-        self.__where_list = []
-        self.__where_condition_list = []
-        self.__select = []
-        self.__insert_or_update_list = []
-        self.__order_by_list = []
-        self.__group_by = ''
-
-        return query
+        return "".join(parts)
 
-    def _connect(self) -> MySQLdb:
+    def _get_pool(self) -> ConnectionPool:
         """"
-        MySQLに接続する
+        接続情報に対応するコネクションプールを取得する
 
         Returns
         -------
-            MySQLdb : MySQLdb.connect
-                MySQLdbインスタンス
+            ConnectionPool
+                コネクションプール
         """
-        setting = self.__default_setting
+        if self.__pool is None:
+            self.__pool = get_connection_pool(self.__default_setting, **self.__pool_setting)
 
-        return MySQLdb.connect(
-            user=setting['user'],
-            passwd=setting['passwd'],
-            host=setting['host'],
-            db=setting['db']
-        )
+        return self.__pool
+
+    def _check_table(self) -> None:
+        """
+        テーブルが指定されているかを確認する
+
+        テーブル未指定のクエリはサーバーに送らずにエラーにする
+        """
+        if not self.__table:
+            raise ValueError("テーブルが指定されていません。from_tableでテーブルを指定してください。")
+
+    def _check_records(self, spec: QuerySpec, execute_query_type: ExecuteQueryType) -> None:
+        """
+        挿入、更新するレコードが指定されているかを確認する
+
+        Parameters
+        ----------
+            spec: QuerySpec
+                組み立てるクエリの内容
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ
+        """
+        if execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT, ExecuteQueryType.UPDATE] and not spec.records:
+            raise ValueError("挿入、更新するレコードが指定されていません。set、setsでレコードを指定してください。")
+
+    def _queue_insert(self, data: dict) -> bool:
+        """
+        挿入するレコードを指定中のテーブルに溜める
+
+        Parameters
+        ----------
+            data: dict
+                挿入するレコード
+
+        Returns
+        -------
+            is_full: bool
+                溜めたレコードがinsert_chunk_size件に達したかどうか
+        """
+        self._check_table()
+
+        records = self.__pending_inserts.setdefault(self.__table, [])
+        records.append(data)
+
+        return len(records) >= self.__insert_chunk_size
+
+    def _take_pending_inserts(self) -> list:
+        """
+        溜めているレコードをテーブル毎の挿入クエリの内容として取り出す
+
+        Returns
+        -------
+            specs: list
+                テーブル毎のQuerySpecのリスト
+        """
+        specs = [
+            QuerySpec(table=table, selects=(), wheres=(), order_by=(), group_by='', records=tuple(records))
+            for table, records in self.__pending_inserts.items()
+        ]
+        self.__pending_inserts = {}
+
+        return specs
+
+    def _discard_pending_inserts(self) -> None:
+        """
+        溜めているレコードを破棄する
+        """
+        self.__pending_inserts = {}
 
     def _add_wheres(self, column: str, value: Any, condtion: str) -> None:
         """
@@ -746,8 +1775,7 @@ class SqlManager:
             str: condition
                 条件
         """
-        self.__where_list.append({column: value})
-        self.__where_condition_list.append({column: condtion})
+        self.__where_list.append((column, condtion, value))
 
     def _is_use_aggregate_functions(self, column: str) -> bool:
         """
@@ -763,32 +1791,366 @@ class SqlManager:
             is_mathc: bool
                 利用しているかどうか
         """
-        pattern_list = [
-            'AVG',
-            'BIT_AND',
-            'BIT_OR',
-            'BIT_XOR',
-            'COUNT',
-            'GROUP_CONCAT',
-            'JSON_ARRAYAGG',
-            'JSON_OBJECTAGG',
-            'MAX',
-            'MIN',
-            'STD',
-            'STDDEV',
-            'STDDEV_POP',
-            'STDDEV_POP',
-            'SUM',
-            'VAR_POP',
-            'VAR_SAMP',
-            'VARIANCE'
-        ]
+        upper_column = column.upper()
+        if upper_column.startswith(_AGG_PREFIXES):
+            return True
+
+        return _AGG_RE.search(upper_column) is not None
+
+
+class AsyncSqlManager(SqlManager):
+    """
+    aiomysqlを利用した非同期版のSqlManager
+
+    クエリの組み立てはSqlManagerと共通で、実行のみ非同期で行う
+    """
+
+    __slots__ = (
+        '__async_setting',
+        '__async_pool',
+        '__async_connection',
+        '__async_enable_transaction'
+    )
+
+    def __init__(self, settings: dict, minsize: int = 2, maxsize: int = 20, insert_chunk_size: int = 1000) -> None:
+        """
+        コンストラクタ
+
+        Parameters
+        ----------
+            settings: dict
+                接続情報
+            minsize: int
+                プールに保持するコネクションの最小数
+            maxsize: int
+                プールに保持するコネクションの最大数
+            insert_chunk_size: int
+                複数レコードの挿入時に1回で送信するレコード数
+        """
+        if aiomysql is None:
+            raise ImportError("AsyncSqlManagerを利用するにはaiomysqlをインストールしてください。")
+
+        super().__init__(settings, insert_chunk_size=insert_chunk_size)
+        self.__async_setting = {
+            'user': settings['user'],
+            'password': settings['passwd'],
+            'host': settings['host'],
+            'db': settings['db'],
+            'minsize': minsize,
+            'maxsize': maxsize
+        }
+        self.__async_pool = None
+        self.__async_connection = None
+        self.__async_enable_transaction = False
+
+    async def close(self) -> None:
+        """
+        コネクションプールを閉じる
+
+        トランザクション中であればrollbackしてトランザクションを終了する
+        (借りたままのコネクションを返却しないとプールが閉じるのを待ち続けるため)
+        そうでなければqueue_createで溜めているレコードを挿入してから閉じる
+        """
+        # クエリを実行せずにトランザクションを開始していた場合も終了させる
+        if self.__async_connection is not None or self.__async_enable_transaction:
+            await self.end_transaction(False)
+        else:
+            await self.flush()
+
+        if self.__async_pool is None:
+            return
+
+        self.__async_pool.close()
+        await self.__async_pool.wait_closed()
+        self.__async_pool = None
+
+    async def begin_transaction(self) -> None:
+        """
+        トランザクション開始
+
+        queue_createで溜めているレコードはトランザクションに含めず、開始前に挿入する
+        """
+        await self.flush()
+        self.__async_enable_transaction = True
 
-        is_match = False
-        for pattern in pattern_list:
-            pattern = f"[a-zA-Z0-9_]?{pattern}\(.*\)[a-zA-Z0-9_]?"
-            if re.search(pattern, column, re.IGNORECASE) != None:
-                is_match = True
-                break
+    def enable_result_cache(self, maxsize: int = 128) -> 'SqlManager':
+        """
+        取得結果のキャッシュは同期版のSqlManagerでのみ利用できる
+
+        Raises
+        ------
+            TypeError
+                常に送出する
+        """
+        raise TypeError("enable_result_cacheは同期版のSqlManager専用のため、AsyncSqlManagerでは利用できません。")
+
+    async def end_transaction(self, is_succeed: bool) -> None:
+        """
+        トランザクション終了
+
+        Parameters
+        ----------
+            is_succeed : bool
+                処理が成功したのならばコミットする。
+                してなければrollbackする。
+                トランザクション中にqueue_createで溜めたレコードは成功時は挿入し、失敗時は破棄する
+        """
+        if is_succeed:
+            await self.flush()
+        else:
+            self._discard_pending_inserts()
+
+        self.__async_enable_transaction = False
+
+        if self.__async_connection is None:
+            return
+
+        if is_succeed:
+            await self.__async_connection.commit()
+        else:
+            await self.__async_connection.rollback()
+        self.__async_pool.release(self.__async_connection)
+        self.__async_connection = None
+
+    async def update(self) -> None:
+        """
+        データを更新する
+        """
+        await self._execute_async(ExecuteQueryType.UPDATE)
+
+    async def create(self) -> None:
+        """
+        レコードを作成する
+
+        複数レコードの場合はexecutemanyでまとめて挿入し、1回でコミットする
+        """
+        await self._execute_async(ExecuteQueryType.INSERT)
+
+    async def upsert(self) -> None:
+        """
+        レコードを作成し、キーが重複する場合は更新する
+
+        INSERT ... ON DUPLICATE KEY UPDATEで挿入と更新を1回のクエリで行う
+        複数レコードの場合はexecutemanyでまとめて送信し、1回でコミットする
+        """
+        await self._execute_async(ExecuteQueryType.UPSERT)
+
+    async def queue_create(self, data: dict) -> 'AsyncSqlManager':
+        """
+        挿入するレコードを溜めておき、まとめて挿入する
+
+        溜めたレコードがinsert_chunk_size件に達するか、flush、end_transaction(True)を
+        呼び出した時点でテーブル毎に複数レコードの挿入を行う
+
+        Paramters
+        ---------
+            data : dict
+                挿入するレコード {"id" : 1, "name" : "test",...}
+
+        Returns
+        -------
+            self : AsyncSqlManager
+                自身のインスタンス
+        """
+        if self._queue_insert(data):
+            await self.flush()
+
+        return self
+
+    async def flush(self) -> None:
+        """
+        queue_createで溜めているレコードを挿入する
+        """
+        for spec in self._take_pending_inserts():
+            await self._execute_async(ExecuteQueryType.INSERT, spec=spec)
+
+    async def count(self) -> int:
+        """
+        レコード数を取得する
+
+        Returns
+        -------
+            int(rows[0][0]) : int
+                レコード数
+        """
+        return await self._execute_async(ExecuteQueryType.COUNT)
+
+    async def delete(self) -> None:
+        """
+        レコードを削除する
+        """
+        await self._execute_async(ExecuteQueryType.DELETE)
+
+    async def find_records(self, is_dict_cursor: bool = False, stream: bool = False) -> Any:
+        """
+        複数データを取得する
+
+        Paramters
+        ---------
+            is_dict_cursor : bool
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+            stream : bool
+                サーバーサイドカーソルで1行ずつ取得するかどうか(find_records_iterと同じ)
+
+        Returns
+        -------
+            is_dict_cursor が Falseの場合 [[1, 2,...],...]
+
+            is_dict_cursor が Trueの場合  [{'key1' : 1, 'key2' : 2, ...},...]
+
+            stream が Trueの場合は上記の1行ずつを返す非同期ジェネレータ
+        """
+        if stream:
+            return self.find_records_iter(is_dict_cursor)
+
+        return await self._execute_async(ExecuteQueryType.SELECT, is_dict_cursor)
+
+    def find_records_iter(self, is_dict_cursor: bool = False) -> AsyncIterator:
+        """
+        複数データを1行ずつ取得する
+
+        サーバーサイドカーソルを利用するため、結果をすべてメモリに載せずに処理できる
+
+        Paramters
+        ---------
+            is_dict_cursor : bool
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+        Returns
+        -------
+            取得したレコードを1行ずつ返す非同期ジェネレータ
+        """
+        query, holder_value_list = self._query_build(ExecuteQueryType.SELECT)
+
+        return self._iterate_records_async(query, holder_value_list, is_dict_cursor)
+
+    async def _execute_async(self, execute_query_type: ExecuteQueryType, is_dict_cursor: Union[bool, None] = None, spec: Union[QuerySpec, None] = None):
+        """
+        実行クエリタイプに沿ったクエリの実行を非同期で行う。
+
+        Paramters
+        ---------
+            execute_query_type: ExecuteQueryType
+                実行クエリタイプ
+            
+            is_dict_cursor: Union[bool, None]
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+            spec: Union[QuerySpec, None]
+                組み立てるクエリの内容(Noneの場合は組み立て中の内容を使う)
+
+        Returns
+        -------
+            retValue: Any
+                execute_query_type が SELECTの場合: list
+                execute_query_type が COUNTの場合: int
+        """
+        query, holder_value_list = self._query_build(execute_query_type, spec)
+
+        # 複数レコードの挿入は1回でコミットする
+        autocommit = not (execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT] and len(holder_value_list) > 1)
+
+        async with self._connection_async(autocommit) as conn:
+            async with conn.cursor(aiomysql.DictCursor) if is_dict_cursor else conn.cursor() as cur:
+                if execute_query_type in [ExecuteQueryType.INSERT, ExecuteQueryType.UPSERT]:
+                    for records in self._split_insert_records(holder_value_list):
+                        await cur.executemany(query, records)
+                        self._set_last_insert_id(cur.lastrowid)
+                else:
+                    await cur.execute(query, holder_value_list)
+
+                retVal = None
+                if execute_query_type == ExecuteQueryType.SELECT:
+                    retVal = await cur.fetchall()
+                elif execute_query_type == ExecuteQueryType.COUNT:
+                    rows = await cur.fetchall()
+                    retVal = int(rows[0][0])
+
+        return retVal
+
+    async def _iterate_records_async(self, query: str, holder_value_list: Union[list, None], is_dict_cursor: bool) -> AsyncIterator:
+        """
+        サーバーサイドカーソルでSELECTを実行し、1行ずつ返す
+
+        Paramters
+        ---------
+            query: str
+                実行するクエリ
+
+            holder_value_list: Union[list, None]
+                プレースホルダに渡す値
+
+            is_dict_cursor: bool
+                Dict形式で取得するかどうか(Falseの場合はlist形式)
+
+        Returns
+        -------
+            取得したレコードを1行ずつ返す非同期ジェネレータ
+        """
+        async with self._connection_async() as conn:
+            async with conn.cursor(aiomysql.SSDictCursor if is_dict_cursor else aiomysql.SSCursor) as cur:
+                await cur.execute(query, holder_value_list)
+
+                while True:
+                    row = await cur.fetchone()
+                    if row is None:
+                        break
+                    yield row
+
+    @asynccontextmanager
+    async def _connection_async(self, autocommit: bool = True):
+        """
+        クエリを実行するコネクションを取得する
+
+        トランザクション中であればトランザクション用のコネクションを、
+        そうでなければプールから借りたコネクションを返す
+
+        Parameters
+        ----------
+            autocommit: bool
+                トランザクション外でautocommitにするかどうか
+                Falseの場合はwithブロックを抜けた時にコミットする(例外時はrollbackする)
+
+        Returns
+        -------
+            conn : aiomysql.Connection
+                コネクション
+        """
+        pool = await self._get_async_pool()
+
+        if self.__async_enable_transaction:
+            if self.__async_connection is None:
+                self.__async_connection = await pool.acquire()
+                await self.__async_connection.autocommit(False)
+            yield self.__async_connection
+            return
+
+        async with pool.acquire() as conn:
+            await conn.autocommit(autocommit)
+            if autocommit:
+                yield conn
+                return
+
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
+
+    async def _get_async_pool(self) -> 'aiomysql.Pool':
+        """
+        aiomysqlのコネクションプールを取得する
+
+        プールはイベントループに紐づくため、インスタンス毎に初回利用時に作成する
+
+        Returns
+        -------
+            aiomysql.Pool
+                コネクションプール
+        """
+        if self.__async_pool is None:
+            self.__async_pool = await aiomysql.create_pool(**self.__async_setting)
 
-        return is_match
+        return self.__async_pool
@@ -1,9 +1,23 @@
 import unittest
+from unittest.mock import AsyncMock
 from unittest.mock import MagicMock
+from unittest.mock import patch
 from SqlManager import SqlManager
+from SqlManager import AsyncSqlManager
+from SqlManager import ConnectionPool
+from SqlManager import ExecuteQueryType
+import SqlManager as sql_manager_module
+import asyncio
 import json
+import MySQLdb
 
 class TestSqlManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # 接続情報はテストクラスで1度だけ読み込む
+        with open('test_setting.json', 'r') as f:
+            cls.sql_setting = json.load(f)
     
     def setUp(self):
         print(f"begin test: {self._testMethodName}")
@@ -88,6 +102,27 @@ class TestSqlManager(unittest.TestCase):
         sqlManager.select('type')
         self.assertEqual(({'name': 'test_find_records', 'type': None},), sqlManager.find_records(True))
 
+    def test_find_records_iter(self):
+        sqlManager = self.__get_sql_manager()
+        sqlManager.from_table('test')
+        sqlManager.sets([
+            {'name' : 'test_find_records_iter_a', 'type' : 1},
+            {'name' : 'test_find_records_iter_b', 'type' : 2},
+        ])
+        sqlManager.create()
+
+        sqlManager.select('name')
+        sqlManager.order_by_asc(['name'])
+        self.assertEqual([('test_find_records_iter_a',), ('test_find_records_iter_b',)], list(sqlManager.find_records_iter()))
+
+        sqlManager.select('name')
+        sqlManager.where('type', 2)
+        self.assertEqual([{'name': 'test_find_records_iter_b'}], list(sqlManager.find_records_iter(True)))
+
+        sqlManager.select('name')
+        sqlManager.where('type', 1)
+        self.assertEqual([('test_find_records_iter_a',)], list(sqlManager.find_records(stream=True)))
+
     def test_sets(self):
         sqlManager = self.__get_sql_manager()
         sqlManager.from_table('test')
@@ -232,6 +267,493 @@ class TestSqlManager(unittest.TestCase):
         sqlManager.select('name')
         self.assertEqual((), sqlManager.find_records())
 
+    @unittest.skipIf(sql_manager_module.aiomysql is None, 'aiomysqlがインストールされていません。')
+    def test_async(self):
+        async def run() -> None:
+            sqlManager = AsyncSqlManager(self.__get_sql_setting())
+            try:
+                sqlManager.from_table('test')
+                sqlManager.sets([
+                    {'name' : 'test_async_a', 'type' : 1},
+                    {'name' : 'test_async_b', 'type' : 2},
+                ])
+                await sqlManager.create()
+
+                self.assertEqual(2, await sqlManager.count())
+
+                sqlManager.where('type', 2)
+                sqlManager.select('name')
+                self.assertEqual((('test_async_b',),), await sqlManager.find_records())
+            finally:
+                await sqlManager.close()
+
+        asyncio.run(run())
+
+
+    def __get_sql_manager(self) -> SqlManager:
+        """
+        テスト用SqlManagerを取得
+
+        Returns
+        -------
+            SqlMaanger
+        """
+
+        return SqlManager(self.__get_sql_setting())
+
+    def __get_sql_setting(self) -> dict:
+        """
+        テスト用の接続情報を取得
+
+        Returns
+        -------
+            dict
+        """
+
+        sql_setting = self.sql_setting
+
+        return {
+                'user' : sql_setting['user'],
+                'passwd' : sql_setting['passwd'],
+                'host' : sql_setting['host'],
+                'db' : sql_setting['db']
+            }
+
+
+class TestSqlManagerQuery(unittest.TestCase):
+    """
+    DBに接続せずに、組み立てたクエリとドライバの呼び出しを確認する
+    """
+
+    # コネクションはモックに差し替えるため接続されない
+    SQL_SETTING = {
+        'user' : 'test',
+        'passwd' : 'test',
+        'host' : 'localhost',
+        'db' : 'test'
+    }
+
+    def setUp(self):
+        self.conn_mock = self.__get_connect_mock()
+        self.cur_mock = self.conn_mock.cursor.return_value
+
+        patcher = patch.object(SqlManager, '_get_pool', return_value=self.__get_pool_mock(self.conn_mock))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_where_in_query(self) -> None:
+        sqlManager = self.__get_sql_manager()
+        sqlManager.from_table('test')
+        sqlManager.where_in('type', [1, 2, 3])
+        sqlManager.where('name', 'test_where_in')
+        sqlManager.find_records()
+
+        self.cur_mock.execute.assert_called_once_with(
+            'SELECT * FROM test WHERE `type` IN (%s, %s, %s) AND `name` = %s', [1, 2, 3, 'test_where_in'])
+
+
+    def test_where_chain_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        for i in range(10):
+            sqlManager = sqlManager.where_gt('id', i).where_lt('type', i)
+        sqlManager.group_by(['name', 'type']).order_by_asc(['name']).find_records()
+
+        self.cur_mock.execute.assert_called_once_with(
+            'SELECT * FROM test WHERE ' + ' AND '.join(['`id` > %s AND `type` < %s'] * 10) + ' GROUP BY name, type ORDER BY name ASC ',
+            [v for i in range(10) for v in (i, i)])
+
+
+    def test_where_fluent_query(self) -> None:
+        self.__get_sql_manager().from_table('test') \
+            .where_in('id', [1, 2]).where_not_in('type', [3]) \
+            .where_gte('id', 1).where_lte('id', 9) \
+            .where_like('name', 'a%').where_is_null('note').where_is_not_null('type') \
+            .group_by('type').find_records()
+
+        self.cur_mock.execute.assert_called_once_with(
+            'SELECT * FROM test WHERE `id` IN (%s, %s) AND `type` NOT IN (%s) AND `id` >= %s AND `id` <= %s'
+            ' AND `name` LIKE %s AND `note` IS NULL AND `type` IS NOT NULL GROUP BY type',
+            [1, 2, 3, 1, 9, 'a%'])
+
+
+    def test_no_table_query(self) -> None:
+        sqlManager = self.__get_sql_manager()
+        with self.assertRaises(ValueError):
+            sqlManager.where('id', 1).count()
+        with self.assertRaises(ValueError):
+            sqlManager.find_records_iter()
+
+        self.cur_mock.execute.assert_not_called()
+
+        # エラーになったクエリの条件は次のクエリに残らない
+        sqlManager.from_table('test').where('type', 2).find_records()
+        self.cur_mock.execute.assert_called_once_with('SELECT * FROM test WHERE `type` = %s', [2])
+
+
+    def test_no_records_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        with self.assertRaises(ValueError):
+            sqlManager.sets([]).create()
+        with self.assertRaises(ValueError):
+            sqlManager.sets(()).upsert()
+        with self.assertRaises(ValueError):
+            sqlManager.where('type', 1).update()
+
+        self.cur_mock.execute.assert_not_called()
+        self.cur_mock.executemany.assert_not_called()
+
+
+    def test_create_query(self) -> None:
+        records = [{'name' : f'test_create_query_{i}', 'type' : i} for i in range(4)]
+        self.__get_sql_manager().from_table('test').sets(records).create()
+
+        # 1行分のテンプレートを1回だけ送信し、1レコードずつINSERTしない
+        self.cur_mock.execute.assert_not_called()
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [(record['name'], record['type']) for record in records])
+        self.conn_mock.commit.assert_called_once()
+
+
+    def test_sets_tuple_query(self) -> None:
+        records = ({'name' : 'test_sets_tuple_a', 'type' : 1}, {'name' : 'test_sets_tuple_b', 'type' : 2})
+        self.__get_sql_manager().from_table('test').sets(records).create()
+
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [('test_sets_tuple_a', 1), ('test_sets_tuple_b', 2)])
+
+
+    def test_last_insert_id(self) -> None:
+        self.cur_mock.lastrowid = 10
+
+        sqlManager = self.__get_sql_manager().from_table('test')
+        self.assertIsNone(sqlManager.last_insert_id())
+        sqlManager.set('name', 'test_last_insert_id').create()
+
+        self.assertEqual(10, sqlManager.last_insert_id())
+        self.cur_mock.execute.assert_not_called()
+
+
+    def test_create_chunk_query(self) -> None:
+        records = [{'name' : f'test_create_chunk_query_{i}', 'type' : i} for i in range(5)]
+        sqlManager = self.__get_sql_manager(insert_chunk_size=2)
+        sqlManager.from_table('test').sets(records).create()
+
+        # insert_chunk_size件毎に分割して送信し、コミットは1回にまとめる
+        self.assertEqual(
+            [[(record['name'], record['type']) for record in records[i:i + 2]] for i in range(0, 5, 2)],
+            [call.args[1] for call in self.cur_mock.executemany.call_args_list])
+        self.conn_mock.commit.assert_called_once()
+
+
+    def test_queue_create_query(self) -> None:
+        sqlManager = self.__get_sql_manager(insert_chunk_size=2)
+        sqlManager.begin_transaction()
+        sqlManager.from_table('test')
+        for i in range(3):
+            sqlManager.queue_create({'name' : 'test_queue_create', 'type' : i})
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [('test_queue_create', 0), ('test_queue_create', 1)])
+
+        sqlManager.end_transaction(True)
+
+        self.cur_mock.executemany.assert_called_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [('test_queue_create', 2)])
+        self.assertEqual(2, self.cur_mock.executemany.call_count)
+        self.conn_mock.commit.assert_called_once()
+
+
+    def test_queue_create_rollback_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.queue_create({'name' : 'test_queue_create_before', 'type' : 1})
+
+        # トランザクション開始前に溜めたレコードはrollbackしても破棄されない
+        sqlManager.begin_transaction()
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [('test_queue_create_before', 1)])
+        self.conn_mock.autocommit.assert_called_once_with(True)
+
+        sqlManager.queue_create({'name' : 'test_queue_create_in', 'type' : 2})
+        sqlManager.end_transaction(False)
+        sqlManager.flush()
+
+        self.cur_mock.executemany.assert_called_once()
+
+
+    def test_queue_create_close_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.queue_create({'name' : 'test_queue_create_close', 'type' : 1})
+
+        # トランザクション外で溜めたレコードはcloseで挿入される
+        sqlManager.close()
+
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`name`, `type`) VALUES(%s, %s)', [('test_queue_create_close', 1)])
+
+
+    def test_holder_reset_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.set(1, 'test_holder_reset_a').where('type', 1)
+        with self.assertRaises(AttributeError):
+            sqlManager.update()
+
+        sqlManager.set('name', 'test_holder_reset_b').where('type', 2).update()
+
+        self.cur_mock.execute.assert_called_once_with('UPDATE test SET `name` = %s WHERE `type` = %s', ['test_holder_reset_b', 2])
+
+
+    def test_build_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        query, holder_value_list = sqlManager.select('name').where('name', 'test_build').build()
+        sqlManager.find_records()
+
+        self.assertEqual('SELECT `name` FROM test WHERE `name` = %s', query)
+        self.assertEqual(['test_build'], holder_value_list)
+        self.cur_mock.execute.assert_called_once_with('SELECT * FROM test')
+
+        self.assertEqual(
+            ('UPDATE test SET `name` = %s WHERE `type` = %s', ['test_build', 1]),
+            sqlManager.set('name', 'test_build').where('type', 1).build(ExecuteQueryType.UPDATE))
+
+
+    def test_reset_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.select('name').where('type', 1).order_by_asc(['name'])
+        sqlManager.reset_query()
+        with self.assertRaises(ValueError):
+            sqlManager.find_records()
+
+        sqlManager.from_table('test').where('type', 2).find_records()
+
+        self.cur_mock.execute.assert_called_once_with('SELECT * FROM test WHERE `type` = %s', [2])
+
+
+    @unittest.skipIf(sql_manager_module.aiomysql is None, 'aiomysqlがインストールされていません。')
+    def test_async_close_in_transaction(self) -> None:
+        async_conn_mock = MagicMock()
+        async_conn_mock.autocommit = AsyncMock()
+        async_conn_mock.rollback = AsyncMock()
+        async_conn_mock.cursor.return_value.__aenter__.return_value.execute = AsyncMock()
+
+        async_pool_mock = MagicMock()
+        async_pool_mock.acquire = AsyncMock(return_value=async_conn_mock)
+        async_pool_mock.wait_closed = AsyncMock()
+
+        async def run() -> None:
+            sqlManager = AsyncSqlManager(self.SQL_SETTING)
+            with self.assertRaises(TypeError):
+                sqlManager.enable_result_cache()
+
+            await sqlManager.begin_transaction()
+            await sqlManager.from_table('test').where('type', 1).delete()
+            await sqlManager.close()
+
+        with patch.object(sql_manager_module.aiomysql, 'create_pool', AsyncMock(return_value=async_pool_mock)):
+            asyncio.run(run())
+
+        # 借りたままのコネクションはrollbackして返却してからプールを閉じる
+        async_conn_mock.rollback.assert_awaited_once()
+        async_pool_mock.release.assert_called_once_with(async_conn_mock)
+        async_pool_mock.wait_closed.assert_awaited_once()
+
+
+    @unittest.skipIf(sql_manager_module.aiomysql is None, 'aiomysqlがインストールされていません。')
+    def test_async_close_without_statement(self) -> None:
+        async_conn_mock = MagicMock()
+        async_conn_mock.autocommit = AsyncMock()
+        async_conn_mock.cursor.return_value.__aenter__.return_value.execute = AsyncMock()
+
+        async_pool_mock = MagicMock()
+        async_pool_mock.acquire.return_value.__aenter__.return_value = async_conn_mock
+        async_pool_mock.wait_closed = AsyncMock()
+
+        async def run() -> None:
+            sqlManager = AsyncSqlManager(self.SQL_SETTING)
+            await sqlManager.begin_transaction()
+            await sqlManager.close()
+
+            # closeの後のクエリはトランザクション外で実行される
+            await sqlManager.from_table('test').where('type', 1).delete()
+
+        with patch.object(sql_manager_module.aiomysql, 'create_pool', AsyncMock(return_value=async_pool_mock)):
+            asyncio.run(run())
+
+        async_conn_mock.autocommit.assert_awaited_once_with(True)
+
+
+    def test_pool_reconnect(self) -> None:
+        dead_conn_mock = self.__get_connect_mock()
+        dead_conn_mock.ping.side_effect = MySQLdb.OperationalError(2006, 'MySQL server has gone away')
+        conn_mock = self.__get_connect_mock()
+
+        with patch.object(ConnectionPool, '_connect', side_effect=[dead_conn_mock, conn_mock]), \
+                patch.object(ConnectionPool, 'PING_INTERVAL', 0):
+            pool = ConnectionPool(self.SQL_SETTING, mincached=1)
+            self.assertIs(conn_mock, pool.acquire())
+
+        dead_conn_mock.close.assert_called_once()
+
+
+    def test_pool_failed_connection(self) -> None:
+        dead_conn_mock = self.__get_connect_mock()
+        dead_conn_mock.ping.side_effect = MySQLdb.OperationalError(2006, 'MySQL server has gone away')
+        conn_mock = self.__get_connect_mock()
+
+        with patch.object(ConnectionPool, '_connect', side_effect=[dead_conn_mock, conn_mock]):
+            pool = ConnectionPool(self.SQL_SETTING, mincached=1)
+            with self.assertRaises(MySQLdb.OperationalError):
+                with pool.connection():
+                    raise MySQLdb.OperationalError(2006, 'MySQL server has gone away')
+
+            # エラーが発生したコネクションは使用直後でも生存確認し、切断されていれば接続し直す
+            self.assertIs(conn_mock, pool.acquire())
+
+        dead_conn_mock.ping.assert_called_once()
+        dead_conn_mock.close.assert_called_once()
+
+
+    def test_transaction_failed_connection(self) -> None:
+        dead_conn_mock = self.__get_connect_mock()
+        dead_conn_mock.rollback.side_effect = MySQLdb.OperationalError(2006, 'MySQL server has gone away')
+        dead_conn_mock.ping.side_effect = MySQLdb.OperationalError(2006, 'MySQL server has gone away')
+        conn_mock = self.__get_connect_mock()
+
+        with patch.object(ConnectionPool, '_connect', side_effect=[dead_conn_mock, conn_mock]):
+            pool = ConnectionPool(self.SQL_SETTING, mincached=0)
+            with patch.object(SqlManager, '_get_pool', return_value=pool):
+                sqlManager = self.__get_sql_manager().from_table('test')
+                sqlManager.begin_transaction()
+                sqlManager.where('type', 1).delete()
+                with self.assertRaises(MySQLdb.OperationalError):
+                    sqlManager.end_transaction(False)
+
+            # rollbackに失敗したコネクションも返却され、次回の貸し出し時に生存確認される
+            self.assertIs(conn_mock, pool.acquire())
+
+        dead_conn_mock.ping.assert_called_once()
+        dead_conn_mock.close.assert_called_once()
+
+
+    def test_transaction_cursor(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.begin_transaction()
+        sqlManager.set('name', 'test_transaction_cursor').create()
+        sqlManager.where('name', 'test_transaction_cursor').delete()
+        self.cur_mock.close.assert_not_called()
+
+        sqlManager.end_transaction(True)
+
+        self.conn_mock.cursor.assert_called_once_with()
+        self.cur_mock.close.assert_called_once()
+        self.conn_mock.commit.assert_called_once()
+
+
+    def test_close_in_transaction(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.begin_transaction()
+        sqlManager.close()
+
+        # closeの後のクエリはトランザクション外で実行される
+        sqlManager.where('type', 1).delete()
+
+        self.conn_mock.autocommit.assert_called_once_with(True)
+
+
+    def test_upsert_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.sets([{'id' : 1, 'name' : 'test_upsert_a'}, {'id' : 2, 'name' : 'test_upsert_b'}])
+        sqlManager.upsert()
+
+        self.cur_mock.executemany.assert_called_once_with(
+            'INSERT INTO test(`id`, `name`) VALUES(%s, %s) ON DUPLICATE KEY UPDATE `id` = VALUES(`id`), `name` = VALUES(`name`)',
+            [(1, 'test_upsert_a'), (2, 'test_upsert_b')])
+        self.conn_mock.commit.assert_called_once()
+
+
+    def test_where_condition_query(self) -> None:
+        # (where関数, 引数, 想定するクエリ, 想定するプレースホルダの値)
+        cases = [
+            ('where', ('type', 1), 'DELETE FROM test WHERE `type` = %s', [1]),
+            ('where_in', ('type', [1, 2]), 'DELETE FROM test WHERE `type` IN (%s, %s)', [1, 2]),
+            ('where_not_in', ('type', [1, 2]), 'DELETE FROM test WHERE `type` NOT IN (%s, %s)', [1, 2]),
+            ('where_gt', ('type', 1), 'DELETE FROM test WHERE `type` > %s', [1]),
+            ('where_gte', ('type', 1), 'DELETE FROM test WHERE `type` >= %s', [1]),
+            ('where_lt', ('type', 1), 'DELETE FROM test WHERE `type` < %s', [1]),
+            ('where_lte', ('type', 1), 'DELETE FROM test WHERE `type` <= %s', [1]),
+            ('where_like', ('name', 'a%'), 'DELETE FROM test WHERE `name` LIKE %s', ['a%']),
+            ('where_is_null', ('type',), 'DELETE FROM test WHERE `type` IS NULL', None),
+            ('where_is_not_null', ('type',), 'DELETE FROM test WHERE `type` IS NOT NULL', None),
+        ]
+
+        sqlManager = self.__get_sql_manager().from_table('test')
+        for name, args, query, holder_value_list in cases:
+            with self.subTest(name=name):
+                self.cur_mock.reset_mock()
+                getattr(sqlManager, name)(*args).delete()
+                if holder_value_list is None:
+                    self.cur_mock.execute.assert_called_once_with(query)
+                else:
+                    self.cur_mock.execute.assert_called_once_with(query, holder_value_list)
+
+
+    def test_result_cache(self) -> None:
+        self.cur_mock.fetchall.return_value = (('test_result_cache',),)
+
+        sqlManager = self.__get_sql_manager().from_table('test').enable_result_cache()
+        for _ in range(2):
+            self.assertEqual((('test_result_cache',),), sqlManager.select('name').where('type', 1).find_records())
+        self.assertEqual(1, self.cur_mock.execute.call_count)
+
+        # 更新系のクエリを実行したらキャッシュは破棄される
+        sqlManager.where('type', 2).delete()
+        sqlManager.select('name').where('type', 1).find_records()
+        self.assertEqual(3, self.cur_mock.execute.call_count)
+
+        # ハッシュできない値を指定したクエリはキャッシュせず毎回問い合わせる
+        for _ in range(2):
+            sqlManager.select('name').where('type', bytearray(b'1')).find_records()
+        self.assertEqual(5, self.cur_mock.execute.call_count)
+
+        # Dict形式の結果もキャッシュし、書き換えられてもキャッシュした結果は変わらない
+        self.cur_mock.fetchall.return_value = ({'name' : 'test_result_cache'},)
+        for _ in range(2):
+            rows = sqlManager.select('name').where('type', 1).find_records(True)
+            self.assertEqual(({'name' : 'test_result_cache'},), rows)
+            rows[0]['name'] = 'test_result_cache_changed'
+        self.assertEqual(6, self.cur_mock.execute.call_count)
+
+
+    def test_select_aggregate_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.select('count(id)', 'cnt')
+        sqlManager.select('name')
+        sqlManager.select('FOUNDATION_COUNT(id)')
+        sqlManager.select('COALESCE(SUM (type), 0)', 'total')
+        sqlManager.find_records()
+
+        self.cur_mock.execute.assert_called_once_with(
+            'SELECT count(id) AS cnt,`name`,`FOUNDATION_COUNT(id)`,COALESCE(SUM (type), 0) AS total FROM test')
+
+
+    def test_selects_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.select('name').select('COUNT(*)').select('type').group_by(['name', 'type']).find_records()
+        sqlManager.selects('name', 'COUNT(*)', 'type').group_by(['name', 'type']).find_records()
+
+        first_call, second_call = self.cur_mock.execute.call_args_list
+        self.assertEqual('SELECT `name`,COUNT(*),`type` FROM test GROUP BY name, type', first_call.args[0])
+        self.assertEqual(first_call, second_call)
+
+
+    def test_update_query(self) -> None:
+        sqlManager = self.__get_sql_manager().from_table('test')
+        sqlManager.where('name', 'test_update_query').where_in('type', [1, 2])
+        sqlManager.set({'name' : 'test_update', 'type' : 3})
+        sqlManager.update()
+
+        self.cur_mock.execute.assert_called_once_with(
+            'UPDATE test SET `name` = %s, `type` = %s WHERE `name` = %s AND `type` IN (%s, %s)',
+            ['test_update', 3, 'test_update_query', 1, 2])
+
 
     def __get_connect_mock(self) -> MagicMock:
         """
@@ -247,31 +769,48 @@ class TestSqlManager(unittest.TestCase):
 
         cur_mock = MagicMock()
         cur_mock.execute.return_value = result_mock
+        cur_mock.__enter__.return_value = cur_mock
 
         conn_mock = MagicMock()
         conn_mock.cursor.return_value = cur_mock
 
         return conn_mock
-    
-    def __get_sql_manager(self) -> SqlManager:
+
+    def __get_pool_mock(self, conn_mock: MagicMock) -> MagicMock:
+        """
+        コネクションプールのモックを取得
+
+        Parameters
+        ----------
+            conn_mock : MagicMock
+                プールから貸し出すコネクションのモック
+
+        Returns
+        -------
+            pool_mock : MagicMock
+                コネクションプールのモック
+        """
+        pool_mock = MagicMock()
+        pool_mock.acquire.return_value = conn_mock
+        pool_mock.connection.return_value.__enter__.return_value = conn_mock
+
+        return pool_mock
+
+    def __get_sql_manager(self, insert_chunk_size: int = 1000) -> SqlManager:
         """
         テスト用SqlManagerを取得
 
+        Parameters
+        ----------
+            insert_chunk_size : int
+                複数レコードの挿入時に1回で送信するレコード数
+
         Returns
         -------
             SqlMaanger
         """
 
-        sql_setting = {}
-        with open('test_setting.json', 'r') as f:
-            sql_setting = json.load(f)
-
-        return SqlManager({
-                'user' : sql_setting['user'],
-                'passwd' : sql_setting['passwd'],
-                'host' : sql_setting['host'],
-                'db' : sql_setting['db']
-            })
+        return SqlManager(self.SQL_SETTING, insert_chunk_size=insert_chunk_size)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file